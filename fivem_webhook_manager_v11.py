@@ -12,15 +12,25 @@ FIXES:
 
 import os
 import re
+import shutil
 import json
 import asyncio
+import multiprocessing
+import threading
+import time
 import discord
 from discord import app_commands
 from pathlib import Path
-from typing import Dict, List, Set, Optional, Tuple
+from typing import Callable, Dict, List, Set, Optional, Tuple
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import chain
 from datetime import datetime
 import sys
+import tempfile
+
+from scanner_core import build_replacer, scan_config_batch
 
 try:
     from dotenv import load_dotenv
@@ -42,8 +52,11 @@ class Config:
                    '.vscode', 'dist', 'build', 'target', 'obj', 'bin']
     
     rate_limit_delay: float = 1.5
-    channel_creation_delay: float = 1.5
-    webhook_creation_delay: float = 1.0
+    creation_concurrency: int = 5
+    
+    scan_batch_size: int = 64
+    progress_interval: float = 2.0
+    mmap_threshold: int = 64 * 1024
     
     create_backups: bool = True
     backup_dir: str = "webhook_backups"
@@ -66,6 +79,36 @@ class Config:
 
 config = Config()
 
+_EXTENSIONS = frozenset(ext.lower() for ext in config.file_extensions)
+_SKIP_FOLDERS = frozenset(folder.lower() for folder in config.skip_folders)
+
+
+_DISCORD_WORD_RE = re.compile(r'\bdiscord\b', re.IGNORECASE)
+_CLYDE_WORD_RE = re.compile(r'\bclyde\b', re.IGNORECASE)
+_SEPARATOR_RE = re.compile(r'[\s_]+')
+_INVALID_CHANNEL_CHARS_RE = re.compile(r'[^a-z0-9\-]')
+_DASH_RUN_RE = re.compile(r'-+')
+
+_scan_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _get_scan_pool() -> ProcessPoolExecutor:
+    """Scan worker processes, started on first use and reused by every scan"""
+    global _scan_pool
+    if _scan_pool is None:
+        # Spawn rather than fork: the bot process is running the gateway
+        # threads, and spawn is what Windows hosts get anyway.
+        _scan_pool = ProcessPoolExecutor(mp_context=multiprocessing.get_context('spawn'))
+    return _scan_pool
+
+
+def _discard_scan_pool(wait: bool = True):
+    """Shut the scan pool down; the next scan starts a fresh one"""
+    global _scan_pool
+    pool, _scan_pool = _scan_pool, None
+    if pool is not None:
+        pool.shutdown(wait=wait)
+
 
 class EnhancedScanner:
     """Ultra-aggressive webhook scanner with proper resource detection"""
@@ -73,39 +116,61 @@ class EnhancedScanner:
     def __init__(self):
         self.base_path = Path(config.fivem_path).resolve()
         self.webhooks_by_resource: Dict[str, Set[str]] = defaultdict(set)
-        self.file_occurrences: Dict[str, List[Tuple[str, str]]] = defaultdict(list)
+        self.file_occurrences: Dict[str, Set[Tuple[str, str]]] = defaultdict(set)
         self.scan_stats = {
             'files_scanned': 0,
             'webhooks_found': 0,
             'files_with_webhooks': 0,
             'resources_found': set()
         }
-        
-        self.webhook_url_pattern = re.compile(
-            r'https?://(?:discord(?:app)?\.com|ptb\.discord\.com)/api/webhooks/\d+/[\w-]+',
-            re.IGNORECASE
-        )
-        
-        self.webhook_value_patterns = [
-            re.compile(r'["\']webhook[_\s-]*url?["\']\s*[:=]\s*["\']([^"\']+)["\']', re.IGNORECASE | re.MULTILINE),
-            re.compile(r'\bwebhook\s*[:=]\s*["\']([^"\']+)["\']', re.IGNORECASE | re.MULTILINE),
-            re.compile(r'\bwebhook_?url\s*[:=]\s*["\']([^"\']+)["\']', re.IGNORECASE | re.MULTILINE),
-            re.compile(r'\bwebhookurl\s*[:=]\s*["\']([^"\']+)["\']', re.IGNORECASE | re.MULTILINE),
-            re.compile(r'webhook["\']?\s*[:=]\s*["\']([^"\']+)["\']', re.IGNORECASE | re.MULTILINE),
-            re.compile(r'["\']url["\']\s*[:=]\s*["\'](https?://discord[^"\']+)["\']', re.IGNORECASE | re.MULTILINE),
-        ]
+        self._resource_cache: Dict[str, str] = {}
     
     async def scan(self, progress_callback=None) -> Dict[str, Set[str]]:
-        files = list(self._get_all_files())
+        loop = asyncio.get_running_loop()
+        files = await loop.run_in_executor(None, lambda: list(self._get_all_files()))
         
         if progress_callback:
             await progress_callback(message=f"📁 Scanning {len(files)} files in {self.base_path}")
         
-        for idx, file_path in enumerate(files):
-            self._scan_file(file_path)
-            
-            if progress_callback and idx > 0 and idx % 500 == 0:
-                await progress_callback(message=f"⏳ Progress: {idx}/{len(files)} files... ({len(self.webhooks_by_resource)} resources, {self.scan_stats['webhooks_found']} webhooks)")
+        batch_size = config.scan_batch_size
+        batches = [files[i:i + batch_size] for i in range(0, len(files), batch_size)]
+        scanned = 0
+        progress_task = None
+        last_progress = time.monotonic()
+        
+        merged = 0
+        for attempt in range(2):
+            pending = []
+            try:
+                pending = self._submit_batches(loop, batches[merged:])
+                for batch, future in zip(batches[merged:], pending):
+                    for file_path, webhook_urls in await future:
+                        self._record_file(file_path, webhook_urls)
+                    
+                    merged += 1
+                    scanned += len(batch)
+                    
+                    # Fire and forget, skipping ticks while the last update is sending
+                    now = time.monotonic()
+                    if (progress_callback and scanned < len(files)
+                            and now - last_progress >= config.progress_interval
+                            and (progress_task is None or progress_task.done())):
+                        last_progress = now
+                        progress_task = asyncio.create_task(progress_callback(message=f"⏳ Progress: {scanned}/{len(files)} files... ({len(self.webhooks_by_resource)} resources, {self.scan_stats['webhooks_found']} webhooks)"))
+                break
+            except BrokenProcessPool as e:
+                # A worker died, e.g. SIGBUS from a file truncated while mapped.
+                # A broken pool rejects all later work, so replace it and retry
+                # the batches not merged yet once before giving up. The pool
+                # fails every outstanding future itself; collect them so none
+                # is left with an unretrieved exception.
+                await asyncio.gather(*pending, return_exceptions=True)
+                _discard_scan_pool(wait=False)
+                if attempt:
+                    raise RuntimeError("A scan worker process crashed twice; run /scan-webhooks again") from e
+        
+        if progress_task:
+            await progress_task
         
         self.scan_stats['files_scanned'] = len(files)
         
@@ -118,109 +183,79 @@ class EnhancedScanner:
         
         return self.webhooks_by_resource
     
+    @staticmethod
+    def _submit_batches(loop: asyncio.AbstractEventLoop, batches: List[List[str]]) -> List[asyncio.Future]:
+        """Queue every batch on the scan pool"""
+        pool = _get_scan_pool()
+        return [loop.run_in_executor(pool, scan_config_batch, batch, config.mmap_threshold) for batch in batches]
+    
     def _get_all_files(self):
         """Get ALL files, no exceptions"""
-        for root, dirs, files in os.walk(self.base_path, topdown=True, followlinks=False):
-            dirs[:] = [d for d in dirs if not any(skip in d.lower() for skip in config.skip_folders)]
-            
-            for file in files:
-                if any(file.lower().endswith(ext) for ext in config.file_extensions):
-                    yield Path(root) / file
+        return self._walk(str(self.base_path))
     
-    def _scan_file(self, file_path: Path):
-        """Scan file for webhooks with proper resource attribution"""
+    def _walk(self, directory: str):
+        """Recurse with os.scandir so file/dir checks reuse the readdir data"""
         try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-            
-            found_any = False
-            resource_name = self._extract_resource_name(file_path)
-            
-            for match in self.webhook_url_pattern.finditer(content):
-                webhook_url = match.group(0)
-                if self._is_valid_webhook(webhook_url):
-                    self.webhooks_by_resource[resource_name].add(webhook_url)
-                    self.file_occurrences[webhook_url].append((str(file_path), resource_name))
-                    self.scan_stats['webhooks_found'] += 1
-                    self.scan_stats['resources_found'].add(resource_name)
-                    found_any = True
-            
-            for pattern in self.webhook_value_patterns:
-                for match in pattern.finditer(content):
-                    webhook_url = match.group(1)
-                    if self._is_valid_webhook(webhook_url):
-                        self.webhooks_by_resource[resource_name].add(webhook_url)
-                        self.file_occurrences[webhook_url].append((str(file_path), resource_name))
-                        self.scan_stats['webhooks_found'] += 1
-                        self.scan_stats['resources_found'].add(resource_name)
-                        found_any = True
-            
-            if found_any:
-                self.scan_stats['files_with_webhooks'] += 1
+            entries = os.scandir(directory)
+        except OSError:
+            return
         
-        except Exception as e:
-            pass
+        with entries:
+            for entry in entries:
+                try:
+                    name = entry.name.lower()
+                    if entry.is_dir(follow_symlinks=False):
+                        if name not in _SKIP_FOLDERS:
+                            yield from self._walk(entry.path)
+                    elif name[name.rfind('.'):] in _EXTENSIONS and entry.is_file():
+                        yield entry.path
+                except OSError:
+                    continue
     
-    def _extract_resource_name(self, file_path: Path) -> str:
+    def _record_file(self, file_path: str, webhook_urls: List[str]):
+        """Attribute a file's webhooks to its resource"""
+        resource_name = self._extract_resource_name(file_path)
+        
+        for webhook_url in webhook_urls:
+            self.webhooks_by_resource[resource_name].add(webhook_url)
+            self.file_occurrences[webhook_url].add((file_path, resource_name))
+            self.scan_stats['webhooks_found'] += 1
+        
+        self.scan_stats['resources_found'].add(resource_name)
+        self.scan_stats['files_with_webhooks'] += 1
+    
+    def _extract_resource_name(self, file_path: str) -> str:
         """
         Extract resource name with proper hierarchy handling.
         This fixes the issue where webhooks were assigned to wrong resources.
         """
+        directory, filename = os.path.split(file_path)
+        cached = self._resource_cache.get(directory)
+        if cached is not None:
+            return cached
+        
         try:
-            relative = file_path.relative_to(self.base_path)
-            parts = list(relative.parts)
-            
-            if not parts:
-                return 'unknown'
-            
-            resource_name = None
-            
-            if 'resources' in parts:
-                res_idx = parts.index('resources')
-                if res_idx + 1 < len(parts):
-                    resource_name = parts[res_idx + 1]
-            
-            if not resource_name and len(parts) >= 1:
-                if parts[0].startswith('[') and parts[0].endswith(']'):
-                    if len(parts) >= 2:
-                        resource_name = parts[1]
-                    else:
-                        resource_name = parts[0]
-                else:
-                    resource_name = parts[0]
-            
-            if resource_name:
-                resource_name = resource_name.strip('[]').strip()
-                return resource_name if resource_name else 'unknown'
-            
+            relative = os.path.relpath(directory, self.base_path)
+        except ValueError:
             return 'unknown'
         
-        except Exception as e:
-            return 'unknown'
-    
-    def _is_valid_webhook(self, url: str) -> bool:
-        """Strict webhook validation"""
-        if not url or len(url) < 50:
-            return False
-        
-        url_lower = url.lower()
-        if not any(domain in url_lower for domain in ['discord.com/api/webhooks/', 'discordapp.com/api/webhooks/']):
-            return False
+        parts = [] if relative == os.curdir else relative.split(os.sep)
+        parts.append(filename)
         
-        parts = url.split('/')
-        if len(parts) < 7:
-            return False
+        index = 0
+        if 'resources' in parts and parts.index('resources') + 1 < len(parts):
+            index = parts.index('resources') + 1
+        elif parts[0].startswith('[') and parts[0].endswith(']') and len(parts) >= 2:
+            index = 1
         
-        webhook_id = parts[-2]
-        webhook_token = parts[-1]
+        resource_name = parts[index].strip('[]').strip() or 'unknown'
         
-        if not webhook_id.isdigit() or len(webhook_id) < 17:
-            return False
+        # A file sitting directly in the resources/category folder names
+        # itself, so only folder-derived names are shared by the directory.
+        if index < len(parts) - 1:
+            self._resource_cache[directory] = resource_name
         
-        if len(webhook_token) < 50 or not all(c.isalnum() or c in '-_' for c in webhook_token):
-            return False
-        
-        return True
+        return resource_name
 
 
 class WebhookCreator:
@@ -231,6 +266,8 @@ class WebhookCreator:
         self.category_id = int(category_id)
         self.webhook_mappings: Dict[str, str] = {}
         self.created_channels = []
+        self._channels_by_name: Dict[str, discord.TextChannel] = {}
+        self._channel_locks: Dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
     
     async def create_all(self, webhooks_by_resource: Dict[str, Set[str]], progress_callback=None):
         total_resources = len(webhooks_by_resource)
@@ -238,27 +275,35 @@ class WebhookCreator:
         if progress_callback:
             await progress_callback(message=f"🔨 Creating {total_resources} channels (1 per resource)...")
         
-        for idx, (resource_name, old_webhooks) in enumerate(sorted(webhooks_by_resource.items())):
+        category = self.guild.get_channel(self.category_id)
+        if not category:
+            if progress_callback:
+                await progress_callback(message=f"❌ Category not found!")
+            return False
+        
+        self._channels_by_name = {channel.name: channel for channel in category.text_channels}
+        
+        # Bounded concurrency; discord.py handles the rate limits
+        semaphore = asyncio.Semaphore(config.creation_concurrency)
+        await asyncio.gather(*(
+            self._create_for_resource(f"{idx+1}/{total_resources}", resource_name, old_webhooks, category, semaphore, progress_callback)
+            for idx, (resource_name, old_webhooks) in enumerate(webhooks_by_resource.items())
+        ))
+        
+        return True
+    
+    async def _create_for_resource(self, position: str, resource_name: str, old_webhooks: Set[str], category, semaphore: asyncio.Semaphore, progress_callback=None):
+        """Set up one resource's channel and webhooks"""
+        async with semaphore:
             try:
                 channel_name = self._sanitize_name(f"{resource_name}-logs")
+                channel, created = await self._get_or_create_channel(channel_name, category)
                 
-                category = self.guild.get_channel(self.category_id)
-                if not category:
-                    if progress_callback:
-                        await progress_callback(message=f"❌ Category not found!")
-                    return False
-                
-                existing_channel = discord.utils.get(self.guild.text_channels, name=channel_name, category_id=self.category_id)
-                
-                if existing_channel:
-                    channel = existing_channel
-                    if progress_callback:
-                        await progress_callback(message=f"♻️  [{idx+1}/{total_resources}] Reusing #{channel_name} ({len(old_webhooks)} webhooks)")
-                else:
-                    channel = await self.guild.create_text_channel(name=channel_name, category=category)
-                    if progress_callback:
-                        await progress_callback(message=f"✅ [{idx+1}/{total_resources}] Created #{channel_name} ({len(old_webhooks)} webhooks)")
-                    await asyncio.sleep(config.channel_creation_delay)
+                if progress_callback:
+                    if created:
+                        await progress_callback(message=f"✅ [{position}] Created #{channel_name} ({len(old_webhooks)} webhooks)")
+                    else:
+                        await progress_callback(message=f"♻️  [{position}] Reusing #{channel_name} ({len(old_webhooks)} webhooks)")
                 
                 self.created_channels.append({
                     'name': channel_name,
@@ -271,29 +316,35 @@ class WebhookCreator:
                     webhook_name = f"{resource_name}" if len(old_webhooks) == 1 else f"{resource_name}-{webhook_idx}"
                     webhook = await channel.create_webhook(name=webhook_name)
                     self.webhook_mappings[old_url] = webhook.url
-                    await asyncio.sleep(config.webhook_creation_delay)
             
             except discord.HTTPException as e:
                 if progress_callback:
-                    await progress_callback(message=f"⚠️  [{idx+1}/{total_resources}] Skipped {resource_name}: {str(e)}")
-                continue
+                    await progress_callback(message=f"⚠️  [{position}] Skipped {resource_name}: {str(e)}")
             except Exception as e:
                 if progress_callback:
-                    await progress_callback(message=f"⚠️  [{idx+1}/{total_resources}] Error with {resource_name}: {str(e)}")
-                continue
-        
-        return True
+                    await progress_callback(message=f"⚠️  [{position}] Error with {resource_name}: {str(e)}")
+    
+    async def _get_or_create_channel(self, channel_name: str, category) -> Tuple[discord.TextChannel, bool]:
+        """Return (channel, created); resources that sanitize to the same name share one channel"""
+        async with self._channel_locks[channel_name]:
+            channel = self._channels_by_name.get(channel_name)
+            if channel:
+                return channel, False
+            
+            channel = await self.guild.create_text_channel(name=channel_name, category=category)
+            self._channels_by_name[channel_name] = channel
+            return channel, True
     
     def _sanitize_name(self, name: str) -> str:
         name = name.lower()
         
         # Discord doesn't allow "discord" in channel names - replace it
-        name = re.sub(r'\bdiscord\b', 'disc', name, flags=re.IGNORECASE)
-        name = re.sub(r'\bclyde\b', 'assistant', name, flags=re.IGNORECASE)
+        name = _DISCORD_WORD_RE.sub('disc', name)
+        name = _CLYDE_WORD_RE.sub('assistant', name)
         
-        name = re.sub(r'[\s_]+', '-', name)
-        name = re.sub(r'[^a-z0-9\-]', '', name)
-        name = re.sub(r'-+', '-', name)
+        name = _SEPARATOR_RE.sub('-', name)
+        name = _INVALID_CHANNEL_CHARS_RE.sub('', name)
+        name = _DASH_RUN_RE.sub('-', name)
         name = name.strip('-')
         
         # Ensure it's not empty and within Discord's limits
@@ -307,8 +358,9 @@ class FileUpdater:
     
     def __init__(self):
         self.stats = {'files_updated': 0, 'replacements': 0, 'files_backed_up': 0}
+        self._backup_lock = threading.Lock()
     
-    async def update_all(self, webhook_mappings: Dict[str, str], file_occurrences: Dict[str, List[Tuple[str, str]]], progress_callback=None):
+    async def update_all(self, webhook_mappings: Dict[str, str], file_occurrences: Dict[str, Set[Tuple[str, str]]], progress_callback=None):
         if config.create_backups:
             backup_dir = Path(config.backup_dir) / datetime.now().strftime('%Y%m%d_%H%M%S')
             backup_dir.mkdir(parents=True, exist_ok=True)
@@ -317,16 +369,29 @@ class FileUpdater:
         else:
             backup_dir = None
         
-        files_to_update = set()
-        for old_url in webhook_mappings.keys():
-            for file_path, _ in file_occurrences.get(old_url, []):
-                files_to_update.add(file_path)
+        files_to_update = set(chain.from_iterable(
+            (file_path for file_path, _ in file_occurrences.get(old_url, ()))
+            for old_url in webhook_mappings
+        ))
         
         if progress_callback:
             await progress_callback(message=f"📝 Updating {len(files_to_update)} files...")
         
-        for idx, file_path in enumerate(files_to_update):
-            self._update_file(Path(file_path), webhook_mappings, backup_dir)
+        replace = build_replacer({old.encode(): new.encode() for old, new in webhook_mappings.items()})
+        
+        loop = asyncio.get_running_loop()
+        pending = [
+            loop.run_in_executor(None, self._update_file, Path(file_path), replace, backup_dir)
+            for file_path in files_to_update
+        ]
+        
+        for idx, future in enumerate(asyncio.as_completed(pending)):
+            replacements, backed_up = await future
+            if replacements > 0:
+                self.stats['files_updated'] += 1
+                self.stats['replacements'] += replacements
+            if backed_up:
+                self.stats['files_backed_up'] += 1
             
             if progress_callback and idx > 0 and idx % 25 == 0:
                 await progress_callback(message=f"⏳ Progress: {idx}/{len(files_to_update)} files updated...")
@@ -334,47 +399,57 @@ class FileUpdater:
         if progress_callback:
             await progress_callback(message=f"✅ Updated {self.stats['files_updated']} files ({self.stats['replacements']} replacements)")
     
-    def _update_file(self, file_path: Path, webhook_mappings: Dict[str, str], backup_dir: Optional[Path]):
+    def _update_file(self, file_path: Path, replace: Callable[[bytes], Tuple[bytes, int]], backup_dir: Optional[Path]) -> Tuple[int, bool]:
+        """Rewrite one file; runs on a worker thread and returns (replacements, backed_up)"""
         try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
+            with open(file_path, 'rb') as f:
+                original = f.read()
             
-            original = content
-            replacements = 0
-            
-            for old_url, new_url in webhook_mappings.items():
-                if old_url in content:
-                    occurrences = content.count(old_url)
-                    content = content.replace(old_url, new_url)
-                    replacements += occurrences
+            content, replacements = replace(original)
             
+            backed_up = False
             if replacements > 0:
                 if backup_dir and config.create_backups:
-                    backup_file = backup_dir / file_path.name
-                    counter = 1
-                    while backup_file.exists():
-                        backup_file = backup_dir / f"{file_path.stem}_{counter}{file_path.suffix}"
-                        counter += 1
-                    
-                    with open(backup_file, 'w', encoding='utf-8', errors='ignore') as f:
+                    backup_file = self._reserve_backup_path(file_path, backup_dir)
+                    with open(backup_file, 'wb') as f:
                         f.write(original)
-                    self.stats['files_backed_up'] += 1
+                    backed_up = True
                 
-                with open(file_path, 'w', encoding='utf-8', errors='ignore') as f:
-                    f.write(content)
-                
-                self.stats['files_updated'] += 1
-                self.stats['replacements'] += replacements
+                # Write beside the original and rename over it, so an
+                # interrupted run never leaves a truncated resource file. The
+                # hidden, unique name can't clobber a user's file or be scanned.
+                fd, tmp_path = tempfile.mkstemp(dir=file_path.parent, prefix='.whtmp')
+                try:
+                    with os.fdopen(fd, 'wb') as f:
+                        f.write(content)
+                    shutil.copymode(file_path, tmp_path)
+                    os.replace(tmp_path, file_path)
+                except OSError:
+                    Path(tmp_path).unlink(missing_ok=True)
+                    raise
+            
+            return replacements, backed_up
         
         except Exception as e:
-            pass
+            return 0, False
+    
+    def _reserve_backup_path(self, file_path: Path, backup_dir: Path) -> Path:
+        """Pick a free backup name and create it so concurrent updates can't claim it too"""
+        with self._backup_lock:
+            backup_file = backup_dir / file_path.name
+            counter = 1
+            while backup_file.exists():
+                backup_file = backup_dir / f"{file_path.stem}_{counter}{file_path.suffix}"
+                counter += 1
+            backup_file.touch()
+        return backup_file
 
 
 class ResultsSaver:
     """Save detailed results"""
     
     @staticmethod
-    async def save(webhook_mappings: Dict[str, str], channels: List[Dict], file_occurrences: Dict[str, List[Tuple[str, str]]], scan_stats: Dict, progress_callback=None):
+    async def save(webhook_mappings: Dict[str, str], channels: List[Dict], file_occurrences: Dict[str, Set[Tuple[str, str]]], scan_stats: Dict, progress_callback=None):
         output_dir = Path(config.output_dir)
         output_dir.mkdir(parents=True, exist_ok=True)
         
@@ -388,7 +463,7 @@ class ResultsSaver:
             },
             'channels_created': channels,
             'webhook_mappings': webhook_mappings,
-            'file_locations': {old_url: [(path, res) for path, res in locs] for old_url, locs in file_occurrences.items()}
+            'file_locations': {old_url: sorted(locs) for old_url, locs in file_occurrences.items()}
         }
         
         json_path = output_dir / 'webhook_mappings.json'
@@ -408,6 +483,11 @@ class ResultsSaver:
             f.write(f"  Total Webhooks:       {data['scan_statistics']['total_webhooks']}\n\n")
             f.write("=" * 80 + "\n\n")
             
+            webhooks_by_resource: Dict[str, List[Tuple[str, str]]] = defaultdict(list)
+            for old_url, new_url in webhook_mappings.items():
+                for resource in {res for _, res in file_occurrences.get(old_url, ())}:
+                    webhooks_by_resource[resource].append((old_url, new_url))
+            
             for channel in sorted(channels, key=lambda x: x['resource']):
                 f.write(f"\n{'=' * 80}\n")
                 f.write(f"RESOURCE: {channel['resource']}\n")
@@ -415,15 +495,12 @@ class ResultsSaver:
                 f.write(f"WEBHOOKS: {channel['webhook_count']}\n")
                 f.write(f"{'=' * 80}\n\n")
                 
-                resource_webhooks = [(old, new) for old, new in webhook_mappings.items() 
-                                    if any(res == channel['resource'] for _, res in file_occurrences.get(old, []))]
-                
-                for idx, (old_url, new_url) in enumerate(resource_webhooks, 1):
+                for idx, (old_url, new_url) in enumerate(webhooks_by_resource.get(channel['resource'], []), 1):
                     f.write(f"Webhook {idx}:\n")
                     f.write(f"  Old: {old_url}\n")
                     f.write(f"  New: {new_url}\n")
                     
-                    files = file_occurrences.get(old_url, [])
+                    files = sorted(file_occurrences.get(old_url, ()))
                     if files:
                         f.write(f"  Found in {len(files)} file(s):\n")
                         for file_path, _ in files[:5]:
@@ -445,6 +522,11 @@ class QBWebhookBot(discord.Client):
         super().__init__(intents=intents)
         self.tree = app_commands.CommandTree(self)
     
+    async def close(self):
+        # shutdown() joins the scan workers, so keep it off the event loop
+        await asyncio.get_running_loop().run_in_executor(None, _discard_scan_pool)
+        await super().close()
+    
     async def setup_hook(self):
         guild = discord.Object(id=int(config.guild_id))
         self.tree.copy_global_to(guild=guild)
@@ -11,16 +11,27 @@ No server wipe, no role management - ONLY webhook automation
 
 import os
 import re
+import errno
 import json
+import shutil
 import asyncio
+import logging
+import mmap
+import threading
+import time
 import aiohttp
 import discord
 from discord import app_commands
 from pathlib import Path
-from typing import Dict, List, Set, Optional
+from typing import Callable, Dict, List, Set, Optional, Tuple
 from collections import defaultdict
+from itertools import chain
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import sys
+import tempfile
+
+from scanner_core import build_replacer, match_webhooks, resource_for_directory, sanitize_channel_name, scan_stream
 
 try:
     from tqdm import tqdm
@@ -28,12 +39,32 @@ try:
 except ImportError:
     TQDM_AVAILABLE = False
 
+try:
+    import re2
+    RE2_AVAILABLE = True
+except ImportError:
+    RE2_AVAILABLE = False
+
+try:
+    import hyperscan
+    HYPERSCAN_AVAILABLE = True
+except ImportError:
+    HYPERSCAN_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 try:
     from dotenv import load_dotenv
     load_dotenv()
 except ImportError:
     pass
 
+logger = logging.getLogger(__name__)
+
 # ============================================
 # ============================================
 
@@ -47,13 +78,18 @@ class Config:
     file_extensions = ['.lua', '.js', '.ts', '.json', '.cfg', '.txt', '.md', '.env', '.xml', '.yml', '.yaml', '.ini']
     skip_folders = ['node_modules', '.git', '__pycache__', 'cache', 'logs', '.idea', '.vscode', 'dist', 'build', 'target']
     webhook_patterns = [
-        r'https://discord\.com/api/webhooks/\d+/[\w-]+',
-        r'https://discordapp\.com/api/webhooks/\d+/[\w-]+',
+        r'https://(?:ptb\.|canary\.)?discord(?:app)?\.com/api/webhooks/\d{17,20}/[\w-]{60,}',
     ]
     
     rate_limit_delay: float = 1.5
-    channel_creation_delay: float = 1.5
-    webhook_creation_delay: float = 1.0
+    creation_concurrency: int = 5
+    
+    scan_workers: int = min(32, (os.cpu_count() or 1) * 4)
+    scan_batch_size: int = 64
+    progress_interval: float = 1.0
+    max_scan_bytes: int = 8 * 1024 * 1024
+    mmap_threshold: int = 64 * 1024
+    stream_extensions = ['.lua', '.js', '.cfg']
     
     create_backups: bool = True
     backup_dir: str = "webhook_backups"
@@ -76,6 +112,164 @@ class Config:
 
 config = Config()
 
+# Oversized source files are read in chunks; the overlap keeps a URL that
+# straddles a chunk boundary inside the next buffer.
+STREAM_CHUNK_BYTES = 1024 * 1024
+STREAM_OVERLAP_BYTES = 128
+
+# os.link failures that mean "can't link here" rather than a real error:
+# another filesystem, or one without hard links.
+_LINK_UNSUPPORTED_ERRNOS = {errno.EXDEV, errno.EPERM, errno.EMLINK, errno.ENOTSUP, errno.EOPNOTSUPP, errno.EINVAL}
+
+_EXT_TUPLE = tuple(config.file_extensions)
+_STREAM_EXT_TUPLE = tuple(config.stream_extensions)
+_SKIP_FOLDERS = frozenset(folder.lower() for folder in config.skip_folders)
+
+
+def _walk_files(directory: str, index: Dict[str, dict], listings: Dict[str, dict]):
+    """Yield every scannable file path, reusing cached listings of unchanged directories"""
+    try:
+        mtime_ns = os.stat(directory).st_mtime_ns
+    except OSError:
+        return
+    
+    # Adding, removing or renaming an entry bumps the directory's mtime, so a
+    # matching mtime means the cached listing is still accurate.
+    listing = index.get(directory)
+    if not _is_listing(listing) or listing['mtime_ns'] != mtime_ns:
+        listing = _list_directory(directory, mtime_ns)
+        if listing is None:
+            return
+    listings[directory] = listing
+    
+    for name in listing['files']:
+        yield os.path.join(directory, name)
+    for name in listing['dirs']:
+        if name.lower() not in _SKIP_FOLDERS:
+            yield from _walk_files(os.path.join(directory, name), index, listings)
+
+
+def _list_directory(directory: str, mtime_ns: int) -> Optional[dict]:
+    """Read a directory's scannable files and subdirectories with os.scandir"""
+    files = []
+    dirs = []
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        dirs.append(entry.name)
+                    elif entry.name.endswith(_EXT_TUPLE) and entry.is_file(follow_symlinks=False):
+                        files.append(entry.name)
+                except OSError:
+                    continue
+    except OSError:
+        return None
+    
+    # A change within the filesystem's timestamp granularity of this listing
+    # would leave the mtime as it is, so a listing that fresh isn't trusted.
+    if time.time_ns() - mtime_ns < 2_000_000_000:
+        mtime_ns = None
+    return {'mtime_ns': mtime_ns, 'files': files, 'dirs': dirs}
+
+
+def _is_listing(listing) -> bool:
+    """Whether a cached listing has the shape _list_directory produces"""
+    # The cache file can be hand-edited or left half-written; anything else
+    # is treated as a miss rather than failing the scan.
+    return (
+        isinstance(listing, dict)
+        and isinstance(listing.get('mtime_ns'), (int, type(None)))
+        and isinstance(listing.get('files'), list)
+        and isinstance(listing.get('dirs'), list)
+        and all(isinstance(name, str) for name in chain(listing['files'], listing['dirs']))
+    )
+
+
+def _load_file_index(path: Path) -> dict:
+    """Load the directory listing cache, or start an empty one"""
+    try:
+        data = path.read_bytes()
+        index = orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
+    except (OSError, ValueError):
+        index = None
+    
+    # Listings only hold files with a scanned extension
+    if (not isinstance(index, dict) or index.get('extensions') != config.file_extensions
+            or not isinstance(index.get('roots'), dict)):
+        index = {'extensions': config.file_extensions, 'roots': {}}
+    return index
+
+
+def _save_file_index(path: Path, index: dict):
+    """Write the directory listing cache; it is only an optimization, so failures are ignored"""
+    data = orjson.dumps(index) if ORJSON_AVAILABLE else json.dumps(index).encode()
+    tmp_path = None
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Replaced in one step, so concurrent runs never leave a half-written file
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix='.whtmp')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        if tmp_path:
+            Path(tmp_path).unlink(missing_ok=True)
+        logger.debug("could not save %s: %s", path, e)
+
+
+class _HyperscanPattern:
+    """Locate webhook URLs with Hyperscan, then match each one with the regex"""
+    
+    def __init__(self, patterns: List[str], pattern):
+        self._database = hyperscan.Database()
+        self._database.compile(
+            expressions=[p.encode() for p in patterns],
+            ids=list(range(len(patterns))),
+            flags=[hyperscan.HS_FLAG_SOM_LEFTMOST] * len(patterns),
+        )
+        self._pattern = pattern
+        # Scratch space can't be shared between concurrent scans
+        self._local = threading.local()
+    
+    def finditer(self, data):
+        """Yield the same matches as pattern.finditer(data)"""
+        scratch = getattr(self._local, 'scratch', None)
+        if scratch is None:
+            scratch = self._local.scratch = hyperscan.Scratch(self._database)
+        
+        # Hyperscan reports every end of a variable-length match; only the
+        # starts matter, and the regex recovers the greedy match from each.
+        starts = set()
+        self._database.scan(data, match_event_handler=lambda pattern_id, start, end, flags, context: starts.add(start), scratch=scratch)
+        
+        # Skipping starts inside the previous match keeps finditer's
+        # non-overlapping results
+        position = 0
+        for start in sorted(starts):
+            if start < position:
+                continue
+            match = self._pattern.match(data, start)
+            if match:
+                position = match.end()
+                yield match
+
+
+def _fsync_directories(directories):
+    """Flush directory entries so the renames made in them are durable"""
+    for directory in directories:
+        try:
+            fd = os.open(directory, os.O_RDONLY)
+        except OSError:
+            # Windows can't open a directory for fsync; NTFS journals renames itself
+            continue
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
 # ============================================
 # ============================================
 
@@ -84,22 +278,76 @@ class QBCoreScanner:
     
     def __init__(self):
         self.base_path = Path(config.fivem_path).resolve()
-        self.webhook_pattern = re.compile('|'.join(config.webhook_patterns))
+        self.webhook_pattern = self._compile_webhook_pattern()
         self.webhooks_by_resource: Dict[str, Set[str]] = defaultdict(set)
         self.file_occurrences: Dict[str, List[tuple]] = defaultdict(list)
+        self.stats = {'files_skipped': 0}
+        self._base_prefix = os.path.join(str(self.base_path), '')
+        self._resource_cache: Dict[str, Optional[str]] = {}
+    
+    @staticmethod
+    def _compile_webhook_pattern():
+        """Compile webhook_patterns with the fastest engine that accepts them: Hyperscan, RE2, then re"""
+        source = '|'.join(config.webhook_patterns).encode()
+        pattern = None
+        if RE2_AVAILABLE:
+            # RE2 runs in linear time whatever the input, so a pathological file can't stall a worker
+            try:
+                pattern = re2.compile(source)
+            except re2.error as e:
+                logger.debug("re2 rejected webhook_patterns: %s", e)
+        if pattern is None:
+            pattern = re.compile(source)
+        
+        if HYPERSCAN_AVAILABLE:
+            try:
+                return _HyperscanPattern(config.webhook_patterns, pattern)
+            except hyperscan.error as e:
+                # Hyperscan doesn't support lookarounds or backreferences
+                logger.debug("hyperscan rejected webhook_patterns: %s", e)
+        return pattern
     
     async def scan(self, progress_callback=None) -> Dict[str, Set[str]]:
         """Scan and return webhooks grouped by resource"""
-        files = list(self._get_files())
+        loop = asyncio.get_running_loop()
+        files = await loop.run_in_executor(None, self._get_files)
         
         if progress_callback:
             await progress_callback(message=f"📁 Found {len(files)} files to scan...")
         
-        for idx, file_path in enumerate(files):
-            self._scan_file(file_path)
+        batch_size = config.scan_batch_size
+        batches = [files[i:i + batch_size] for i in range(0, len(files), batch_size)]
+        scanned = 0
+        progress_task = None
+        last_progress = time.monotonic()
+        
+        # Reads are I/O-bound and release the GIL, so threads overlap the disk
+        # waits; results are merged here on the event loop, in walk order.
+        with ThreadPoolExecutor(max_workers=config.scan_workers) as executor:
+            pending = [loop.run_in_executor(executor, self._scan_batch, batch) for batch in batches]
             
-            if progress_callback and idx % 500 == 0:
-                await progress_callback(message=f"⏳ Scanned {idx}/{len(files)} files...")
+            for batch, future in zip(batches, pending):
+                results, skipped = await future
+                for file_path, webhook_urls in results:
+                    self._record_file(file_path, webhook_urls)
+                self.stats['files_skipped'] += skipped
+                
+                scanned += len(batch)
+                
+                # Progress is sent in the background so the scan never waits on
+                # Discord; updates are dropped while one is still in flight.
+                now = time.monotonic()
+                if (progress_callback and scanned < len(files)
+                        and now - last_progress >= config.progress_interval
+                        and (progress_task is None or progress_task.done())):
+                    last_progress = now
+                    progress_task = asyncio.create_task(progress_callback(message=f"⏳ Scanned {scanned}/{len(files)} files..."))
+        
+        if progress_task:
+            await progress_task
+        
+        if progress_callback and self.stats['files_skipped']:
+            await progress_callback(message=f"⚠️ Skipped {self.stats['files_skipped']} unreadable or oversized files")
         
         if progress_callback:
             total_webhooks = sum(len(urls) for urls in self.webhooks_by_resource.values())
@@ -107,46 +355,75 @@ class QBCoreScanner:
         
         return self.webhooks_by_resource
     
-    def _get_files(self):
-        """Get all files to scan"""
-        for root, dirs, files in os.walk(self.base_path, topdown=True):
-            dirs[:] = [d for d in dirs if not any(skip in d.lower() for skip in config.skip_folders)]
-            
-            for file in files:
-                if any(file.endswith(ext) for ext in config.file_extensions):
-                    yield Path(root) / file
-    
-    def _scan_file(self, file_path: Path):
-        """Scan a single file"""
+    def _get_files(self) -> List[str]:
+        """Get all files to scan, walking only directories changed since the last run"""
+        index_path = Path(config.output_dir) / 'file_index.json'
+        index = _load_file_index(index_path)
+        base = str(self.base_path)
+        
+        cached = index['roots'].get(base)
+        listings: Dict[str, dict] = {}
+        files = list(_walk_files(base, cached if isinstance(cached, dict) else {}, listings))
+        
+        # Only directories still reachable are kept, so removed ones drop out
+        index['roots'][base] = listings
+        _save_file_index(index_path, index)
+        return files
+    
+    def _scan_batch(self, files: List[str]) -> Tuple[List[tuple], int]:
+        """Scan a batch of files on a worker thread, returning (results, skipped)"""
+        results = []
+        skipped = 0
+        for file_path in files:
+            webhook_urls = self._scan_file(file_path)
+            if webhook_urls is None:
+                skipped += 1
+            elif webhook_urls:
+                results.append((file_path, webhook_urls))
+        return results, skipped
+    
+    def _scan_file(self, file_path: str) -> Optional[List[str]]:
+        """Return every webhook URL in a single file, or None if it was skipped"""
         try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+            with open(file_path, 'rb') as f:
+                # Cached listings carry no sizes, and a file can change without
+                # touching its directory, so size the open file itself.
+                size = os.fstat(f.fileno()).st_size
+                if size > config.max_scan_bytes:
+                    if not file_path.endswith(_STREAM_EXT_TUPLE):
+                        logger.warning("skip %s: %d bytes exceeds max_scan_bytes", file_path, size)
+                        return None
+                    return scan_stream(f, self.webhook_pattern, STREAM_CHUNK_BYTES, STREAM_OVERLAP_BYTES)
+                if size >= config.mmap_threshold:
+                    # Scan large files in place instead of copying them into a bytes object
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                        return match_webhooks(mapped, self.webhook_pattern)
                 content = f.read()
             
-            for match in self.webhook_pattern.finditer(content):
-                webhook_url = match.group(0)
-                resource_name = self._get_resource_name(file_path)
-                self.webhooks_by_resource[resource_name].add(webhook_url)
-                self.file_occurrences[webhook_url].append((str(file_path), resource_name))
-        except:
-            pass
-    
-    def _get_resource_name(self, file_path: Path) -> str:
+            return match_webhooks(content, self.webhook_pattern)
+        except (OSError, ValueError) as e:
+            # ValueError: the file shrank to nothing before it could be mapped
+            logger.debug("skip %s: %s", file_path, e)
+            return None
+    
+    def _record_file(self, file_path: str, webhook_urls: List[str]):
+        """Attribute a file's webhooks to its resource"""
+        resource_name = self._get_resource_name(file_path)
+        for webhook_url in webhook_urls:
+            self.webhooks_by_resource[resource_name].add(webhook_url)
+            self.file_occurrences[webhook_url].append((file_path, resource_name))
+    
+    def _get_resource_name(self, file_path: str) -> str:
         """Extract QB-Core resource name"""
-        try:
-            relative = file_path.relative_to(self.base_path)
-            parts = relative.parts
-            
-            if 'resources' in parts:
-                idx = parts.index('resources')
-                if idx + 1 < len(parts):
-                    return parts[idx + 1].strip('[]')
-            
-            if len(parts) > 0:
-                return parts[0].strip('[]')
-            
-            return 'unknown'
-        except:
+        if not file_path.startswith(self._base_prefix):
             return 'unknown'
+        
+        directory, _, filename = file_path[len(self._base_prefix):].rpartition(os.sep)
+        if directory not in self._resource_cache:
+            self._resource_cache[directory] = resource_for_directory(directory)
+        
+        resource_name = self._resource_cache[directory]
+        return filename.strip('[]') if resource_name is None else resource_name
 
 # ============================================
 # ============================================
@@ -158,7 +435,9 @@ class WebhookCreator:
         self.guild = guild
         self.category_id = int(category_id)
         self.webhook_mappings: Dict[str, str] = {}
+        self.resource_webhooks: Dict[str, List[Tuple[str, str]]] = {}
         self.created_channels = []
+        self._existing_channels: Dict[str, discord.TextChannel] = {}
     
     async def create_all(self, webhooks_by_resource: Dict[str, Set[str]], progress_callback=None):
         """Create QB-Core log channels and webhooks"""
@@ -168,59 +447,104 @@ class WebhookCreator:
         if progress_callback:
             await progress_callback(message=f"🔨 Creating {total_resources} log channels...")
         
-        for idx, (resource_name, old_webhooks) in enumerate(sorted(webhooks_by_resource.items())):
-            channel_name = self._sanitize_name(f"{resource_name}-logs")
-            
-            category = self.guild.get_channel(self.category_id)
-            if not category:
-                if progress_callback:
-                    await progress_callback(message=f"❌ Category not found! Check QB_LOGS_CATEGORY_ID")
-                return False
-            
-            existing_channel = discord.utils.get(self.guild.text_channels, name=channel_name)
-            if existing_channel and existing_channel.category_id == self.category_id:
-                channel = existing_channel
-                if progress_callback:
-                    await progress_callback(message=f"♻️ Reusing
-            else:
-                channel = await self.guild.create_text_channel(
-                    name=channel_name,
-                    category=category
-                )
-                if progress_callback:
-                    await progress_callback(message=f"✅ Created
-                await asyncio.sleep(config.channel_creation_delay)
-            
+        category = self.guild.get_channel(self.category_id)
+        if not category:
+            if progress_callback:
+                await progress_callback(message=f"❌ Category not found! Check QB_LOGS_CATEGORY_ID")
+            return False
+        
+        self._existing_channels = {
+            channel.name: channel for channel in self.guild.text_channels
+            if channel.category_id == self.category_id
+        }
+        
+        resources = sorted(webhooks_by_resource.items())
+        channel_names = {resource_name: self._sanitize_name(f"{resource_name}-logs") for resource_name, _ in resources}
+        
+        # discord.py waits out 429s per route bucket itself, so instead of
+        # sleeping between calls we only cap how many requests are in flight.
+        # Resources that sanitize to the same name share one channel.
+        semaphore = asyncio.Semaphore(config.creation_concurrency)
+        unique_names = list(dict.fromkeys(channel_names.values()))
+        channels = await asyncio.gather(*(
+            self._ensure_channel(channel_name, category, semaphore, progress_callback)
+            for channel_name in unique_names
+        ))
+        channels_by_name = dict(zip(unique_names, channels))
+        
+        # A resource whose channel couldn't be created is skipped; the rest
+        # carry on so their mappings are still saved and applied.
+        resources = [
+            (resource_name, old_webhooks) for resource_name, old_webhooks in resources
+            if channels_by_name[channel_names[resource_name]] is not None
+        ]
+        await asyncio.gather(*(
+            self._create_webhooks(resource_name, old_webhooks, channels_by_name[channel_names[resource_name]], semaphore, progress_callback)
+            for resource_name, old_webhooks in resources
+        ))
+        
+        for resource_name, _ in resources:
+            channel_name = channel_names[resource_name]
             self.created_channels.append({
                 'name': channel_name,
-                'id': channel.id,
+                'id': channels_by_name[channel_name].id,
                 'resource': resource_name
             })
-            
-            webhooks_created = 0
-            for webhook_idx, old_url in enumerate(sorted(old_webhooks), 1):
-                webhook_name = f"{resource_name}"
-                if len(old_webhooks) > 1:
-                    webhook_name = f"{resource_name}-{webhook_idx}"
-                
-                webhook = await channel.create_webhook(name=webhook_name)
-                self.webhook_mappings[old_url] = webhook.url
-                webhooks_created += 1
-                await asyncio.sleep(config.webhook_creation_delay)
-            
-            if progress_callback:
-                await progress_callback(message=f"  └─ Created {webhooks_created} webhook(s) in
         
         return True
     
+    async def _ensure_channel(self, channel_name: str, category, semaphore: asyncio.Semaphore, progress_callback=None) -> Optional[discord.TextChannel]:
+        """Reuse the category's channel with this name, or create it; None if Discord refused"""
+        existing_channel = self._existing_channels.get(channel_name)
+        if existing_channel:
+            if progress_callback:
+                await progress_callback(message=f"♻️ Reusing #{channel_name}")
+            return existing_channel
+        
+        try:
+            async with semaphore:
+                channel = await self.guild.create_text_channel(
+                    name=channel_name,
+                    category=category
+                )
+        except discord.HTTPException as e:
+            if progress_callback:
+                await progress_callback(message=f"⚠️ Skipped #{channel_name}: {str(e)}")
+            return None
+        
+        if progress_callback:
+            await progress_callback(message=f"✅ Created #{channel_name}")
+        return channel
+    
+    async def _create_webhooks(self, resource_name: str, old_webhooks: Set[str], channel: discord.TextChannel, semaphore: asyncio.Semaphore, progress_callback=None):
+        """Create one webhook per old URL of a resource"""
+        old_urls = sorted(old_webhooks)
+        names = [resource_name] if len(old_urls) == 1 else [f"{resource_name}-{idx}" for idx in range(1, len(old_urls) + 1)]
+        
+        webhooks = await asyncio.gather(*(self._create_webhook(channel, name, semaphore, progress_callback) for name in names))
+        
+        # Old URLs whose webhook failed are left out, so those files keep their current URL
+        self.resource_webhooks[resource_name] = [
+            (old_url, webhook.url) for old_url, webhook in zip(old_urls, webhooks) if webhook is not None
+        ]
+        self.webhook_mappings.update(self.resource_webhooks[resource_name])
+        
+        if progress_callback:
+            await progress_callback(message=f"  └─ Created {len(self.resource_webhooks[resource_name])} webhook(s) in #{channel.name}")
+    
+    async def _create_webhook(self, channel: discord.TextChannel, name: str, semaphore: asyncio.Semaphore, progress_callback=None) -> Optional[discord.Webhook]:
+        """Create one webhook, or return None if Discord refused"""
+        try:
+            async with semaphore:
+                return await channel.create_webhook(name=name)
+        except discord.HTTPException as e:
+            if progress_callback:
+                await progress_callback(message=f"⚠️ Skipped webhook {name} in #{channel.name}: {str(e)}")
+            return None
+    
     def _sanitize_name(self, name: str) -> str:
         """Sanitize for Discord channel names"""
-        name = name.lower()
-        name = re.sub(r'[\s_]+', '-', name)
-        name = re.sub(r'[^a-z0-9\-]', '', name)
-        name = re.sub(r'-+', '-', name)
-        name = name.strip('-')
-        return name[:100] or 'channel'
+        return sanitize_channel_name(name)
 
 # ============================================
 # ============================================
@@ -229,8 +553,9 @@ class FileUpdater:
     """Update files with new webhook URLs"""
     
     def __init__(self):
-        self.stats = {'files_updated': 0, 'replacements': 0, 'files_backed_up': 0}
+        self.stats = {'files_updated': 0, 'replacements': 0, 'files_backed_up': 0, 'files_skipped': 0}
         self.base_path = Path(config.fivem_path).resolve()
+        self._replacers: Dict[frozenset, Callable[[bytes], Tuple[bytes, int]]] = {}
     
     async def update_all(self, webhook_mappings: Dict[str, str], file_occurrences: Dict[str, List[tuple]], progress_callback=None):
         """Update all files with new webhooks"""
@@ -243,83 +568,162 @@ class FileUpdater:
         else:
             backup_dir = None
         
-        if progress_callback:
-            await progress_callback(message=f"🔍 Searching for files to update...")
-        
-        files_to_update = self._find_all_files_with_webhooks(webhook_mappings)
+        # The scan already recorded where every old URL lives, so there is no
+        # need to walk and re-read the tree to find them again, and each file
+        # only has to be searched for the URLs it actually contains.
+        per_file: Dict[str, Dict[bytes, bytes]] = defaultdict(dict)
+        for old_url, new_url in webhook_mappings.items():
+            for file_path, _ in file_occurrences.get(old_url, ()):
+                per_file[file_path][old_url.encode()] = new_url.encode()
+        files = list(per_file.items())
         
-        if not files_to_update:
+        if not files:
             if progress_callback:
                 await progress_callback(message=f"⚠️ No files found to update. Webhook URLs may already be current.")
             return
         
         if progress_callback:
-            await progress_callback(message=f"📝 Found {len(files_to_update)} files to update...")
-        
-        for idx, file_path in enumerate(files_to_update):
-            self._update_file(file_path, webhook_mappings, backup_dir)
+            await progress_callback(message=f"📝 Found {len(files)} files to update...")
+        
+        loop = asyncio.get_running_loop()
+        batch_size = config.scan_batch_size
+        batches = [files[i:i + batch_size] for i in range(0, len(files), batch_size)]
+        
+        # Two phases so durability costs one barrier per run instead of a
+        # journal flush per file: every new version is written to a temp
+        # file first, and only after a single sync are they renamed in.
+        staged = []
+        with ThreadPoolExecutor(max_workers=config.scan_workers) as executor:
+            pending = [loop.run_in_executor(executor, self._update_batch, batch, backup_dir) for batch in batches]
             
-            if progress_callback and (idx + 1) % 5 == 0:
-                await progress_callback(message=f"⏳ Updated {idx + 1}/{len(files_to_update)} files...")
+            for future in asyncio.as_completed(pending):
+                results, skipped = await future
+                self.stats['files_skipped'] += skipped
+                staged.extend(results)
+                
+                if progress_callback and results:
+                    await progress_callback(message=f"⏳ Rewrote {len(staged)}/{len(files)} files...")
+        
+        if staged:
+            results, skipped = await loop.run_in_executor(None, self._commit_staged, staged)
+            self.stats['files_skipped'] += skipped
+            for replacements, backed_up in results:
+                self.stats['files_updated'] += 1
+                self.stats['replacements'] += replacements
+                if backed_up:
+                    self.stats['files_backed_up'] += 1
+        
+        if progress_callback and self.stats['files_skipped']:
+            await progress_callback(message=f"⚠️ Skipped {self.stats['files_skipped']} files that could not be updated")
         
         if progress_callback:
             await progress_callback(message=f"✅ Updated {self.stats['files_updated']} files ({self.stats['replacements']} replacements)")
     
-    def _find_all_files_with_webhooks(self, webhook_mappings: Dict[str, str]) -> List[Path]:
-        """Scan all files to find those containing old webhook URLs"""
-        files_with_webhooks = []
-        
-        for root, dirs, files in os.walk(self.base_path, topdown=True):
-            dirs[:] = [d for d in dirs if not any(skip in d.lower() for skip in config.skip_folders)]
-            
-            for filename in files:
-                if any(filename.endswith(ext) for ext in config.file_extensions):
-                    file_path = Path(root) / filename
-                    
-                    try:
-                        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                            content = f.read()
-                        
-                        for old_url in webhook_mappings.keys():
-                            if old_url in content:
-                                files_with_webhooks.append(file_path)
-                                break
-                    except:
-                        pass
-        
-        return files_with_webhooks
-    
-    def _update_file(self, file_path: Path, webhook_mappings: Dict[str, str], backup_dir: Optional[Path]):
-        """Update a single file"""
+    def _replacer_for(self, mappings: Dict[bytes, bytes]) -> Callable[[bytes], Tuple[bytes, int]]:
+        """Replacer for a set of old URLs, compiled once per distinct set"""
+        # Files that share a config tend to hold the same webhooks. Worker
+        # threads may race to build the same entry; the duplicate is harmless.
+        key = frozenset(mappings)
+        replace = self._replacers.get(key)
+        if replace is None:
+            replace = self._replacers[key] = build_replacer(mappings)
+        return replace
+    
+    def _update_batch(self, files: List[Tuple[str, Dict[bytes, bytes]]], backup_dir: Optional[Path]) -> Tuple[List[Tuple[Path, str, int, bool]], int]:
+        """Stage a batch of files on a worker thread, returning ((path, tmp_path, replacements, backed_up) per changed file, skipped)"""
+        results = []
+        skipped = 0
+        for file_path, mappings in files:
+            result = self._update_file(Path(file_path), mappings, backup_dir)
+            if result is None:
+                skipped += 1
+            elif result[2] > 0:
+                results.append(result)
+        return results, skipped
+    
+    def _commit_staged(self, staged: List[Tuple[Path, str, int, bool]]) -> Tuple[List[Tuple[int, bool]], int]:
+        """Make the staged temp files durable, rename them over the originals, and flush the renames"""
+        # One barrier for every temp file's data, so no rename can reach the
+        # disk ahead of its contents. Windows has no os.sync; NTFS journals
+        # the data of a file before its rename anyway.
+        if hasattr(os, 'sync'):
+            os.sync()
+        
+        results = []
+        skipped = 0
+        for file_path, tmp_path, replacements, backed_up in staged:
+            try:
+                shutil.copymode(file_path, tmp_path)
+                os.replace(tmp_path, file_path)
+            except OSError as e:
+                Path(tmp_path).unlink(missing_ok=True)
+                logger.warning("skip %s: replace failed: %s", file_path, e)
+                skipped += 1
+                continue
+            results.append((replacements, backed_up))
+        
+        if results:
+            _fsync_directories({file_path.parent for file_path, _, _, _ in staged})
+        return results, skipped
+    
+    def _update_file(self, file_path: Path, mappings: Dict[bytes, bytes], backup_dir: Optional[Path]) -> Optional[Tuple[Path, str, int, bool]]:
+        """Back up a file and write its new version to a temp file beside it, returning (path, tmp_path, replacements, backed_up), or None if it was skipped"""
         try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-            
-            original = content
-            replacements = 0
-            
-            for old_url, new_url in webhook_mappings.items():
-                if old_url in content:
-                    occurrences = content.count(old_url)
-                    content = content.replace(old_url, new_url)
-                    replacements += occurrences
-            
-            if replacements > 0:
-                if backup_dir and config.create_backups:
-                    backup_file = backup_dir / file_path.name
-                    backup_file.parent.mkdir(parents=True, exist_ok=True)
-                    with open(backup_file, 'w', encoding='utf-8', errors='ignore') as f:
-                        f.write(original)
-                    self.stats['files_backed_up'] += 1
-                
-                with open(file_path, 'w', encoding='utf-8', errors='ignore') as f:
-                    f.write(content)
-                
-                self.stats['files_updated'] += 1
-                self.stats['replacements'] += replacements
-        
-        except Exception as e:
-            pass
+            with open(file_path, 'rb') as f:
+                original = f.read()
+        except OSError as e:
+            logger.warning("skip %s: read failed: %s", file_path, e)
+            return None
+        
+        if b'/api/webhooks/' not in original:
+            return file_path, '', 0, False
+        
+        content, replacements = self._replacer_for(mappings)(original)
+        if replacements == 0:
+            return file_path, '', 0, False
+        
+        backed_up = False
+        if backup_dir and config.create_backups:
+            try:
+                backup_file = backup_dir / file_path.relative_to(self.base_path)
+            except ValueError:
+                backup_file = backup_dir / file_path.name
+            try:
+                backup_file.parent.mkdir(parents=True, exist_ok=True)
+                # The original is about to be replaced by a new inode, so a hard
+                # link keeps it without copying; across filesystems, fall back
+                # to a copy (which may still be a reflink).
+                try:
+                    os.link(file_path, backup_file)
+                except FileExistsError:
+                    # An earlier run in the same second already saved this file,
+                    # before it rewrote it; that copy is the real original.
+                    pass
+                except OSError as e:
+                    if e.errno not in _LINK_UNSUPPORTED_ERRNOS:
+                        raise
+                    shutil.copy2(file_path, backup_file)
+            except OSError as e:
+                # Never rewrite a file whose original couldn't be saved
+                logger.warning("skip %s: backup to %s failed: %s", file_path, backup_file, e)
+                return None
+            backed_up = True
+        
+        # Written beside the original and later renamed over it: the backup
+        # link keeps the old inode, and an interrupted run never leaves a
+        # truncated file.
+        tmp_path = None
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=file_path.parent, prefix='.whtmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(content)
+        except OSError as e:
+            if tmp_path:
+                Path(tmp_path).unlink(missing_ok=True)
+            logger.warning("skip %s: write failed: %s", file_path, e)
+            return None
+        
+        return file_path, tmp_path, replacements, backed_up
 
 # ============================================
 # ============================================
@@ -328,7 +732,7 @@ class ResultsSaver:
     """Save results to JSON"""
     
     @staticmethod
-    async def save(webhook_mappings: Dict[str, str], channels: List[Dict], progress_callback=None):
+    async def save(webhook_mappings: Dict[str, str], channels: List[Dict], resource_webhooks: Dict[str, List[Tuple[str, str]]], progress_callback=None):
         """Save webhook mappings"""
         output_dir = Path(config.output_dir)
         output_dir.mkdir(parents=True, exist_ok=True)
@@ -344,24 +748,30 @@ class ResultsSaver:
         }
         
         json_path = output_dir / 'webhook_mappings.json'
-        with open(json_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2)
+        if ORJSON_AVAILABLE:
+            json_path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        else:
+            with open(json_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2)
+        
+        lines = [
+            "=" * 70 + "\n",
+            "QB-CORE WEBHOOK MAPPINGS\n",
+            "=" * 70 + "\n\n",
+            f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n",
+        ]
+        
+        # Each channel lists only the webhooks created for its own resource
+        for channel in channels:
+            lines.append(f"\nChannel: #{channel['name']}\nResource: {channel['resource']}\n{'-' * 70}\n")
+            lines.extend(
+                f"Old: {old_url}\nNew: {new_url}\n\n"
+                for old_url, new_url in resource_webhooks.get(channel['resource'], ())
+            )
         
         guide_path = output_dir / 'webhook_guide.txt'
         with open(guide_path, 'w', encoding='utf-8') as f:
-            f.write("=" * 70 + "\n")
-            f.write("QB-CORE WEBHOOK MAPPINGS\n")
-            f.write("=" * 70 + "\n\n")
-            f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
-            
-            for channel in channels:
-                f.write(f"\nChannel:
-                f.write(f"Resource: {channel['resource']}\n")
-                f.write(f"{'-' * 70}\n")
-                
-                for old_url, new_url in webhook_mappings.items():
-                    f.write(f"Old: {old_url}\n")
-                    f.write(f"New: {new_url}\n\n")
+            f.writelines(lines)
         
         if progress_callback:
             await progress_callback(message=f"💾 Saved results to {output_dir}/")
@@ -415,8 +825,9 @@ async def scan_webhooks(interaction: discord.Interaction):
                 await interaction.followup.send(embed=embed)
             elif message:
                 await interaction.followup.send(message)
-        except:
-            pass
+        except (discord.HTTPException, aiohttp.ClientError, asyncio.TimeoutError, OSError) as e:
+            # A lost progress message shouldn't abort the run
+            logger.debug("progress update failed: %s", e)
     
     try:
         await update_progress(message="🔍 **STEP 1/4: Scanning QB-Core Resources**")
@@ -440,7 +851,7 @@ async def scan_webhooks(interaction: discord.Interaction):
         await updater.update_all(creator.webhook_mappings, scanner.file_occurrences, update_progress)
         
         await update_progress(message="\n💾 **STEP 4/4: Saving Results**")
-        await ResultsSaver.save(creator.webhook_mappings, creator.created_channels, update_progress)
+        await ResultsSaver.save(creator.webhook_mappings, creator.created_channels, creator.resource_webhooks, update_progress)
         
         embed = discord.Embed(
             title="✅ QB-Core Webhook Setup Complete!",
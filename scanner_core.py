@@ -0,0 +1,230 @@
+"""
+Scanner and updater hot paths shared by both bots
+
+Plain, fully annotated functions with no bot or Discord state, so the module
+can be compiled with mypyc (`mypyc scanner_core.py`). The compiled extension
+is picked up in place of this file automatically; without it everything runs
+as ordinary Python. It is also all that fivem_webhook_manager_v11.py's scan
+worker processes need to unpickle their task.
+"""
+
+import mmap
+import os
+import re
+import string
+from typing import Any, BinaryIO, Callable, Dict, List, Optional, Tuple
+
+try:
+    import ahocorasick  # type: ignore
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+WEBHOOK_PATH = b'/api/webhooks/'
+
+# Channel names: whitespace and underscores become dashes, other ASCII
+# outside [a-z0-9-] is dropped, all in one translate pass.
+_CHANNEL_NAME_TABLE = str.maketrans({
+    c: '-' if c.isspace() or c == '_' else None
+    for c in map(chr, range(128))
+    if c not in string.ascii_lowercase + string.digits + '-'
+})
+_DASH_RUN_RE = re.compile(r'-+')
+
+# fivem_webhook_manager_v11.py patterns. Byte patterns: webhook URLs are
+# ASCII, so files never need a full decode. The ID/token bounds mirror
+# is_valid_webhook, so a URL match is already valid.
+_WEBHOOK_URL_RE = re.compile(
+    rb'https?://(?:discord(?:app)?\.com|ptb\.discord\.com)/api/webhooks/\d{17,}/[\w-]{50,}',
+    re.IGNORECASE
+)
+
+# One alternation instead of a pass per pattern; the named group that
+# matched tells us whether we hit a bare URL or a quoted config value.
+_WEBHOOK_RE = re.compile(
+    rb'(?P<url>' + _WEBHOOK_URL_RE.pattern + rb')'
+    rb'|["\']webhook[_\s-]*url?["\']\s*[:=]\s*["\'](?P<quoted_key>[^"\']+)["\']'
+    rb'|\bwebhook_?url\s*[:=]\s*["\'](?P<url_key>[^"\']+)["\']'
+    rb'|webhook["\']?\s*[:=]\s*["\'](?P<webhook_key>[^"\']+)["\']'
+    rb'|["\']url["\']\s*[:=]\s*["\'](?P<discord_url>https?://discord[^"\']+)["\']',
+    re.IGNORECASE
+)
+
+_WEBHOOK_HINT_RE = re.compile(rb'webhook', re.IGNORECASE)
+
+_WEBHOOK_ID_RE = re.compile(r'\d{17,}')
+_WEBHOOK_TOKEN_RE = re.compile(r'[A-Za-z0-9_-]{50,}')
+
+
+def match_webhooks(data: Any, pattern: Any) -> List[str]:
+    """Run the webhook pattern over a bytes-like buffer (bytes or mmap)"""
+    # Nearly every file has no webhook at all; a C substring search
+    # rules those out without decoding or running the regex.
+    if data.find(WEBHOOK_PATH) == -1:
+        return []
+    
+    return [match.group(0).decode('ascii') for match in pattern.finditer(data)]
+
+
+def scan_stream(f: BinaryIO, pattern: Any, chunk_bytes: int, overlap_bytes: int) -> List[str]:
+    """Scan an open file chunk by chunk so memory stays bounded"""
+    found: List[str] = []
+    tail = b''
+    while True:
+        chunk = f.read(chunk_bytes)
+        buffer = tail + chunk
+        # Matches starting in the overlap are left for the next buffer;
+        # one running into the buffer end may continue past it.
+        cutoff = len(buffer) - overlap_bytes if chunk else len(buffer)
+        keep = max(cutoff, 0)
+        
+        if WEBHOOK_PATH in buffer:
+            for match in pattern.finditer(buffer):
+                if match.start() >= cutoff:
+                    break
+                if chunk and match.end() == len(buffer):
+                    keep = match.start()
+                    break
+                found.append(match.group(0).decode('ascii'))
+                keep = max(keep, match.end())
+        
+        if not chunk:
+            return found
+        tail = buffer[keep:]
+
+
+def resource_for_directory(directory: str) -> Optional[str]:
+    """Resource name shared by every file in a directory, or None if each file names itself"""
+    parts = directory.split(os.sep) if directory else []
+    
+    if 'resources' in parts:
+        idx = parts.index('resources')
+        if idx + 1 < len(parts):
+            return parts[idx + 1].strip('[]')
+        return None
+    
+    if parts:
+        return parts[0].strip('[]')
+    
+    return None
+
+
+def sanitize_channel_name(name: str) -> str:
+    """Sanitize for Discord channel names"""
+    name = name.lower().translate(_CHANNEL_NAME_TABLE)
+    if not name.isascii():
+        # Unicode whitespace still separates words; anything else non-ASCII is dropped
+        name = ''.join('-' if c.isspace() else c for c in name).encode('ascii', 'ignore').decode('ascii')
+    name = _DASH_RUN_RE.sub('-', name).strip('-')
+    return name[:100] or 'channel'
+
+
+def is_valid_webhook(url: str) -> bool:
+    """Strict webhook validation"""
+    if not url or len(url) < 50:
+        return False
+    
+    url_lower = url.lower()
+    if not any(domain in url_lower for domain in ['discord.com/api/webhooks/', 'discordapp.com/api/webhooks/']):
+        return False
+    
+    parts = url.split('/')
+    if len(parts) < 7:
+        return False
+    
+    webhook_id = parts[-2]
+    webhook_token = parts[-1]
+    
+    return bool(_WEBHOOK_ID_RE.fullmatch(webhook_id) and _WEBHOOK_TOKEN_RE.fullmatch(webhook_token))
+
+
+def match_config_webhooks(data: Any) -> List[str]:
+    """Find webhook URLs and webhook config values in a bytes-like buffer"""
+    found: List[str] = []
+    for match in _WEBHOOK_RE.finditer(data):
+        group = match.lastgroup or 'url'
+        raw_value = match.group(group)
+        if group == 'url':
+            found.append(raw_value.decode('ascii'))
+            continue
+        
+        # Config values are free-form, so they still need the full check
+        value = raw_value.decode('ascii', 'replace')
+        if is_valid_webhook(value):
+            found.append(value)
+        else:
+            found.extend(url.decode('ascii') for url in _WEBHOOK_URL_RE.findall(raw_value))
+    
+    return found
+
+
+def find_config_webhooks(file_path: str, mmap_threshold: int) -> List[str]:
+    """Return every valid webhook URL in a file, one entry per match"""
+    # Every pattern needs "webhook" somewhere in the match (the URL path is
+    # /api/webhooks/), so files without it can't produce hits.
+    try:
+        with open(file_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size > mmap_threshold:
+                # Large files are scanned in place, where lower() would copy them
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    if not _WEBHOOK_HINT_RE.search(mapped):
+                        return []
+                    return match_config_webhooks(mapped)
+            data = f.read()
+    except (OSError, ValueError):
+        return []
+    
+    # lower() plus a C substring search beats the case-insensitive regex
+    # several times over on files already in memory
+    if b'webhook' not in data.lower():
+        return []
+    return match_config_webhooks(data)
+
+
+def scan_config_batch(file_paths: List[str], mmap_threshold: int) -> List[Tuple[str, List[str]]]:
+    """Process pool entry point: scan a batch of files, keeping only those with webhooks"""
+    results: List[Tuple[str, List[str]]] = []
+    for file_path in file_paths:
+        webhook_urls = find_config_webhooks(file_path, mmap_threshold)
+        if webhook_urls:
+            results.append((file_path, webhook_urls))
+    return results
+
+
+def replace_with_automaton(automaton: Any, data: bytes) -> Tuple[bytes, int]:
+    """Leftmost-longest, non-overlapping replacement of every URL the automaton knows"""
+    # latin-1 maps bytes 1:1 onto code points, so match offsets are byte offsets
+    hits = sorted(
+        (end - length + 1, -length, new_url)
+        for end, (length, new_url) in automaton.iter(data.decode('latin-1'))
+    )
+    
+    chunks: List[bytes] = []
+    position = 0
+    for start, negative_length, new_url in hits:
+        if start < position:
+            continue
+        chunks.append(data[position:start])
+        chunks.append(new_url)
+        position = start - negative_length
+    
+    if not chunks:
+        return data, 0
+    
+    chunks.append(data[position:])
+    return b''.join(chunks), len(chunks) // 2
+
+
+def build_replacer(webhook_mappings: Dict[bytes, bytes]) -> Callable[[bytes], Tuple[bytes, int]]:
+    """Return a function mapping file content to (new_content, replacement_count)"""
+    if AHOCORASICK_AVAILABLE:
+        automaton = ahocorasick.Automaton()
+        for old_url, new_url in webhook_mappings.items():
+            automaton.add_word(old_url.decode('latin-1'), (len(old_url), new_url))
+        automaton.make_automaton()
+        return lambda data: replace_with_automaton(automaton, data)
+    
+    # Longest first so a URL that prefixes another can't shadow it
+    old_urls = sorted(webhook_mappings, key=len, reverse=True)
+    pattern = re.compile(b'|'.join(re.escape(url) for url in old_urls))
+    return lambda data: pattern.subn(lambda match: webhook_mappings[match.group(0)], data)